@@ -4,6 +4,7 @@ import {
     ConverseCommand,
 } from "@aws-sdk/client-bedrock-runtime";
 import { S3Client, PutObjectCommand } from "@aws-sdk/client-s3";
+import sharp from "sharp";
 
 interface AnalyzeRequest {
     imageBase64: string;
@@ -13,13 +14,86 @@ interface AnalyzeRequest {
     nearSensitiveZone: boolean;
 }
 
-type ImageFormat = "png" | "jpeg";
+// Formats Converse accepts directly; TIFF uploads are transcoded for the model
+type ImageFormat = "png" | "jpeg" | "gif" | "webp";
+type UploadFormat = ImageFormat | "tiff";
 
-/** Detect image format from magic bytes. Defaults to png if unknown. */
-function detectImageFormat(bytes: Uint8Array): ImageFormat {
+const IMAGE_EXT: Record<UploadFormat, string> = { png: "png", jpeg: "jpg", gif: "gif", webp: "webp", tiff: "tif" };
+
+// Keep in sync with the accepted types in components/file-upload.tsx
+const UNSUPPORTED_FORMAT_ERROR = "Unsupported image format. Use JPG, PNG, GIF, WebP or TIFF.";
+
+// ── AWS clients (built once per server process, reused across requests) ─────
+let cachedBedrockClient: BedrockRuntimeClient | null = null;
+let cachedS3Client: S3Client | null = null;
+
+function getBedrockClient(region: string): BedrockRuntimeClient {
+    cachedBedrockClient ??= new BedrockRuntimeClient({ region });
+    return cachedBedrockClient;
+}
+
+function getS3Client(region: string): S3Client {
+    cachedS3Client ??= new S3Client({ region });
+    return cachedS3Client;
+}
+
+/** Detect the upload format from magic bytes. Returns null if unknown. */
+function detectImageFormat(bytes: Uint8Array): UploadFormat | null {
     if (bytes.length >= 3 && bytes[0] === 0xff && bytes[1] === 0xd8 && bytes[2] === 0xff) return "jpeg";
     if (bytes.length >= 8 && bytes[0] === 0x89 && bytes[1] === 0x50 && bytes[2] === 0x4e && bytes[3] === 0x47) return "png";
-    return "png";
+    // "GIF8"
+    if (bytes.length >= 4 && bytes[0] === 0x47 && bytes[1] === 0x49 && bytes[2] === 0x46 && bytes[3] === 0x38) return "gif";
+    // "RIFF" .... "WEBP"
+    if (
+        bytes.length >= 12 &&
+        bytes[0] === 0x52 && bytes[1] === 0x49 && bytes[2] === 0x46 && bytes[3] === 0x46 &&
+        bytes[8] === 0x57 && bytes[9] === 0x45 && bytes[10] === 0x42 && bytes[11] === 0x50
+    ) return "webp";
+    // "II*\0" (little-endian) or "MM\0*" (big-endian)
+    if (
+        bytes.length >= 4 &&
+        ((bytes[0] === 0x49 && bytes[1] === 0x49 && bytes[2] === 0x2a && bytes[3] === 0x00) ||
+            (bytes[0] === 0x4d && bytes[1] === 0x4d && bytes[2] === 0x00 && bytes[3] === 0x2a))
+    ) return "tiff";
+    return null;
+}
+
+// ── Model input preprocessing ───────────────────────────────────────────────
+// Nova Pro gains nothing from pixels beyond ~1.5–2 MP, so large photos are
+// downscaled for the Converse call only; S3 still archives the original bytes.
+const MAX_IMAGE_DIMENSION = 1568;
+const RECOMPRESS_THRESHOLD_BYTES = 512_000;
+const JPEG_QUALITY = 82;
+
+/**
+ * Build the Converse image in at most one sharp pass: TIFF is always
+ * transcoded, and large images are downscaled (longest side ≤ 1568 px) and
+ * re-encoded as JPEG. Small images, and re-encodes that come out larger, pass
+ * through. Returns null if a TIFF cannot be decoded.
+ */
+async function prepareModelImage(
+    imageBytes: Uint8Array,
+    uploadFormat: UploadFormat
+): Promise<{ bytes: Uint8Array; format: ImageFormat } | null> {
+    if (uploadFormat !== "tiff" && imageBytes.length <= RECOMPRESS_THRESHOLD_BYTES) {
+        return { bytes: imageBytes, format: uploadFormat };
+    }
+
+    let encoded: Uint8Array;
+    try {
+        encoded = await sharp(imageBytes)
+            .rotate() // apply EXIF orientation before it is stripped
+            .resize({ width: MAX_IMAGE_DIMENSION, height: MAX_IMAGE_DIMENSION, fit: "inside", withoutEnlargement: true })
+            .flatten({ background: "#ffffff" }) // JPEG has no alpha: transparent pixels become white, not black
+            .jpeg({ quality: JPEG_QUALITY })
+            .toBuffer();
+    } catch {
+        // Converse takes the other formats as they are
+        return uploadFormat === "tiff" ? null : { bytes: imageBytes, format: uploadFormat };
+    }
+    return uploadFormat === "tiff" || encoded.length < imageBytes.length
+        ? { bytes: encoded, format: "jpeg" }
+        : { bytes: imageBytes, format: uploadFormat };
 }
 
 // ── Mock waste ticket for when AWS creds are unavailable ─────────────────────
@@ -58,6 +132,104 @@ function generateMockTicket(
     };
 }
 
+// ── Ticket schema prompt (static, built once at module load) ──────────────────
+const TICKET_SCHEMA_PROMPT =
+    "Inspect the image carefully and produce a JSON object with these exact fields:\n" +
+    "waste_detected (boolean), image_quality (CLEAR|BLURRY|OBSTRUCTED|INSUFFICIENT_LIGHT),\n" +
+    "confidence_score (0-1), waste_type (ORGANIC|PLASTIC|E_WASTE|C_D_WASTE|MIXED|OTHER),\n" +
+    "volume_level (LOW|MEDIUM|HIGH|CRITICAL), estimated_weight_kg (number),\n" +
+    "area_covered_sqm (number), stagnant_water_detected (bool), smoke_detected (bool),\n" +
+    "medical_waste_detected (bool), animal_presence (bool),\n" +
+    "high_value_recyclables_present (bool), recyclable_types (string[]),\n" +
+    "priority (P0|P1|P2), action (DISPATCH_NOW|ADD_TO_ROUTE|MONITOR),\n" +
+    "vehicle_type (E_RICKSHAW|PICKUP|COMPACTOR|OTHER), requires_after_photo (bool),\n" +
+    "reasoning (string explaining your analysis).\n\n";
+
+// Asia/Kolkata has no DST, so IST is a fixed +05:30 offset — no tz database lookup needed
+const IST_OFFSET_MS = (5 * 60 + 30) * 60 * 1000;
+
+/** ISO-8601 timestamp in IST, e.g. 2026-03-02T18:00:00+05:30 (same shape as the dataset). */
+function toIstIsoString(date: Date): string {
+    return new Date(date.getTime() + IST_OFFSET_MS).toISOString().slice(0, 19) + "+05:30";
+}
+
+// Matches a reply wrapped in a single ```json ... ``` fence; backticks inside the JSON are left alone
+const JSON_FENCE = /^\s*```(?:json)?\s*([\s\S]*?)\s*```\s*$/;
+
+/** Upload the original image to S3 at s3://<bucket>/images/. Returns the s3:// URI, or "" on failure. */
+async function uploadImageToS3(
+    s3Client: S3Client,
+    bucket: string,
+    imageBytes: Uint8Array,
+    uploadFormat: UploadFormat
+): Promise<string> {
+    try {
+        const imageKey = `images/${crypto.randomUUID()}.${IMAGE_EXT[uploadFormat]}`;
+        await s3Client.send(
+            new PutObjectCommand({
+                Bucket: bucket,
+                Key: imageKey,
+                Body: imageBytes,
+                ContentType: `image/${uploadFormat}`,
+            })
+        );
+        return `s3://${bucket}/${imageKey}`;
+    } catch (s3Error) {
+        console.error("S3 image upload failed. Check AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY and S3_BUCKET in .env.local:", s3Error);
+        return "";
+    }
+}
+
+/** Ask Nova Pro for a waste ticket. Throws if Bedrock is unavailable or returns invalid JSON. */
+async function analyzeWithBedrock(
+    client: BedrockRuntimeClient,
+    imageBytes: Uint8Array,
+    imageFormat: ImageFormat,
+    { lat, lng, areaName, nearSensitiveZone }: Omit<AnalyzeRequest, "imageBase64">
+): Promise<Record<string, unknown>> {
+    const prompt =
+        TICKET_SCHEMA_PROMPT +
+        `GPS (from EXIF - authoritative, do not change):\n` +
+        `  lat=${lat}, lng=${lng}\n` +
+        `  area_name="${areaName}"\n` +
+        `  near_sensitive_zone=${nearSensitiveZone}\n\n` +
+        `Return ONLY the JSON object, no markdown fences, no extra text.`;
+
+    const command = new ConverseCommand({
+        modelId: "amazon.nova-pro-v1:0",
+        messages: [
+            {
+                role: "user",
+                content: [
+                    { text: prompt },
+                    {
+                        image: {
+                            format: imageFormat,
+                            source: { bytes: imageBytes },
+                        },
+                    },
+                ],
+            },
+        ],
+        inferenceConfig: {
+            maxTokens: 4096,
+            temperature: 0.2,
+        },
+    });
+
+    const response = await client.send(command);
+    const outputText =
+        response.output?.message?.content?.[0]?.text || "{}";
+
+    // Parse JSON from response (unwrap an optional markdown fence around the whole reply)
+    const fenced = JSON_FENCE.exec(outputText);
+    const jsonStr = (fenced ? fenced[1] : outputText).trim();
+    const parsed = JSON.parse(jsonStr) as Record<string, unknown>;
+
+    // Override GPS fields to be authoritative
+    return { ...parsed, lat, lng, area_name: areaName, near_sensitive_zone: nearSensitiveZone };
+}
+
 export async function POST(request: NextRequest) {
     try {
         const body = (await request.json()) as AnalyzeRequest;
@@ -68,107 +240,52 @@ export async function POST(request: NextRequest) {
         const coimbatorePrefix = (process.env.S3_COIMBATORE_PREFIX || "coimbatore").replace(/\/$/, "");
         const startTime = Date.now();
 
-        const s3Client = new S3Client({ region });
+        const s3Client = getS3Client(region);
 
-        // Decode base64 to Uint8Array (used for both S3 upload and Bedrock)
-        const imageBytes = Uint8Array.from(atob(imageBase64), (c) => c.codePointAt(0) ?? 0);
-        const imageFormat = detectImageFormat(imageBytes);
-        const imageExt = imageFormat === "jpeg" ? "jpg" : "png";
-        const contentType = imageFormat === "jpeg" ? "image/jpeg" : "image/png";
+        // Decode base64 straight into a Buffer (used for both S3 upload and Bedrock)
+        const imageBytes = Buffer.from(imageBase64, "base64");
+        const uploadFormat = detectImageFormat(imageBytes);
+        if (!uploadFormat) {
+            return NextResponse.json({ error: UNSUPPORTED_FORMAT_ERROR }, { status: 415 });
+        }
 
-        // Upload image to S3 at s3://<bucket>/images/
-        let imageFile = "";
-        try {
-            const imageKey = `images/${crypto.randomUUID()}.${imageExt}`;
-            await s3Client.send(
-                new PutObjectCommand({
-                    Bucket: bucket,
-                    Key: imageKey,
-                    Body: imageBytes,
-                    ContentType: contentType,
-                })
-            );
-            imageFile = `s3://${bucket}/${imageKey}`;
-        } catch (s3Error) {
-            console.error("S3 image upload failed. Check AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY and S3_BUCKET in .env.local:", s3Error);
+        // S3 archives the original bytes; the model gets a downscaled/transcoded copy
+        const modelImage = await prepareModelImage(imageBytes, uploadFormat);
+        if (!modelImage) {
+            return NextResponse.json({ error: UNSUPPORTED_FORMAT_ERROR }, { status: 415 });
         }
 
-        // Try AWS Bedrock; fall back to mock if creds are missing
-        let ticket: Record<string, unknown>;
+        // Upload the image and run the model concurrently; neither depends on the other
+        const [imageFile, analysis] = await Promise.all([
+            uploadImageToS3(s3Client, bucket, imageBytes, uploadFormat),
+            analyzeWithBedrock(getBedrockClient(region), modelImage.bytes, modelImage.format, body).catch((bedrockError): Record<string, unknown> => {
+                // Fall back to mock if creds are missing
+                console.warn("Bedrock call failed, using mock data:", bedrockError);
+                return generateMockTicket(lat, lng, areaName, nearSensitiveZone);
+            }),
+        ]);
 
-        try {
-            const client = new BedrockRuntimeClient({ region });
-
-            const prompt =
-                `Inspect the image carefully and produce a JSON object with these exact fields:\n` +
-                `waste_detected (boolean), image_quality (CLEAR|BLURRY|OBSTRUCTED|INSUFFICIENT_LIGHT),\n` +
-                `confidence_score (0-1), waste_type (ORGANIC|PLASTIC|E_WASTE|C_D_WASTE|MIXED|OTHER),\n` +
-                `volume_level (LOW|MEDIUM|HIGH|CRITICAL), estimated_weight_kg (number),\n` +
-                `area_covered_sqm (number), stagnant_water_detected (bool), smoke_detected (bool),\n` +
-                `medical_waste_detected (bool), animal_presence (bool),\n` +
-                `high_value_recyclables_present (bool), recyclable_types (string[]),\n` +
-                `priority (P0|P1|P2), action (DISPATCH_NOW|ADD_TO_ROUTE|MONITOR),\n` +
-                `vehicle_type (E_RICKSHAW|PICKUP|COMPACTOR|OTHER), requires_after_photo (bool),\n` +
-                `reasoning (string explaining your analysis).\n\n` +
-                `GPS (from EXIF - authoritative, do not change):\n` +
-                `  lat=${lat}, lng=${lng}\n` +
-                `  area_name="${areaName}"\n` +
-                `  near_sensitive_zone=${nearSensitiveZone}\n\n` +
-                `Return ONLY the JSON object, no markdown fences, no extra text.`;
-
-            const command = new ConverseCommand({
-                modelId: "amazon.nova-pro-v1:0",
-                messages: [
-                    {
-                        role: "user",
-                        content: [
-                            { text: prompt },
-                            {
-                                image: {
-                                    format: imageFormat,
-                                    source: { bytes: imageBytes },
-                                },
-                            },
-                        ],
-                    },
-                ],
-                inferenceConfig: {
-                    maxTokens: 4096,
-                    temperature: 0.2,
-                },
-            });
-
-            const response = await client.send(command);
-            const outputText =
-                response.output?.message?.content?.[0]?.text || "{}";
-
-            // Parse JSON from response (handle possible markdown fences)
-            const jsonStr = outputText.replaceAll(/```json\n?/g, "").replaceAll(/```\n?/g, "").trim();
-            ticket = JSON.parse(jsonStr);
-
-            // Override GPS fields to be authoritative
-            ticket.lat = lat;
-            ticket.lng = lng;
-            ticket.area_name = areaName;
-            ticket.near_sensitive_zone = nearSensitiveZone;
-        } catch (bedrockError) {
-            console.warn("Bedrock call failed, using mock data:", bedrockError);
-            ticket = generateMockTicket(lat, lng, areaName, nearSensitiveZone);
-        }
+        // One clock read feeds wall time, created_at and the S3 date folder
+        const now = new Date();
+        const createdAt = toIstIsoString(now);
+        const ticketId = crypto.randomUUID();
 
-        const elapsed = Math.round(Date.now() - startTime) / 1000;
-        ticket.wall_time_seconds = elapsed;
+        // Build the final ticket in one literal instead of appending metadata field by field
+        const ticket = {
+            ...analysis,
+            wall_time_seconds: Math.round(now.getTime() - startTime) / 1000,
+            ticket_id: ticketId,
+            created_at: createdAt,
+            image_file: imageFile,
+        };
 
-        // Add metadata
-        ticket.ticket_id = crypto.randomUUID();
-        ticket.created_at = new Date().toISOString();
-        ticket.image_file = imageFile;
+        // Serialize once: the same body is stored in S3 and returned to the client
+        const jsonBody = JSON.stringify(ticket, null, 2);
 
         // Save ticket JSON to S3: coimbatore/YYYY-MM-DD/<ticket_id>.json
         try {
-            const dateFolder = new Date().toISOString().slice(0, 10); // e.g. 2026-03-02
-            const jsonKey = `${coimbatorePrefix}/${dateFolder}/${ticket.ticket_id as string}.json`;
-            const jsonBody = JSON.stringify(ticket, null, 2);
+            const dateFolder = createdAt.slice(0, 10); // e.g. 2026-03-02
+            const jsonKey = `${coimbatorePrefix}/${dateFolder}/${ticketId}.json`;
             await s3Client.send(
                 new PutObjectCommand({
                     Bucket: bucket,
@@ -181,7 +298,9 @@ export async function POST(request: NextRequest) {
             console.error("S3 ticket JSON upload failed. Check AWS credentials and S3_COIMBATORE_PREFIX in .env.local:", s3JsonError);
         }
 
-        return NextResponse.json(ticket);
+        return new NextResponse(jsonBody, {
+            headers: { "Content-Type": "application/json" },
+        });
     } catch (e) {
         return NextResponse.json(
             { error: String(e) },
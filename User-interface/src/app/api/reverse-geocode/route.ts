@@ -15,6 +15,10 @@ interface Landmark {
     type: string;
 }
 
+// Places calls go through Node's global fetch pool (keep-alive); bound each one
+// so a stalled connection cannot hold the request open indefinitely.
+const PLACES_TIMEOUT_MS = 10_000;
+
 function extractStr(value: unknown): string | null {
     if (value === null || value === undefined) return null;
     if (typeof value === "object" && value !== null) {
@@ -55,6 +59,7 @@ async function performReverseGeocode(
     const geocodeUrl = `https://places.geo.${region}.amazonaws.com/v2/reverse-geocode?key=${encodeURIComponent(apiKey)}`;
     const geocodeRes = await fetch(geocodeUrl, {
         method: "POST",
+        signal: AbortSignal.timeout(PLACES_TIMEOUT_MS),
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ QueryPosition: [lng, lat], Language: "en", MaxResults: 1 }),
     });
@@ -81,6 +86,7 @@ async function performNearbySearch(
     const nearbyUrl = `https://places.geo.${region}.amazonaws.com/v2/search-nearby?key=${encodeURIComponent(apiKey)}`;
     const nearbyRes = await fetch(nearbyUrl, {
         method: "POST",
+        signal: AbortSignal.timeout(PLACES_TIMEOUT_MS),
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
             QueryPosition: [lng, lat],
@@ -132,18 +138,22 @@ export async function POST(request: NextRequest) {
             error?: string;
         } = { short_name: null, full_address: null, landmarks: [] };
 
-        try {
-            const geocodeResult = await performReverseGeocode(lat, lng, apiKey, region);
-            result.short_name = geocodeResult.short_name;
-            result.full_address = geocodeResult.full_address;
-        } catch (e) {
-            result.error = String(e);
+        // Both lookups are independent, so run them over the shared pool concurrently
+        const [geocodeOutcome, nearbyOutcome] = await Promise.allSettled([
+            performReverseGeocode(lat, lng, apiKey, region),
+            performNearbySearch(lat, lng, apiKey, region),
+        ]);
+
+        if (geocodeOutcome.status === "fulfilled") {
+            result.short_name = geocodeOutcome.value.short_name;
+            result.full_address = geocodeOutcome.value.full_address;
+        } else {
+            result.error = String(geocodeOutcome.reason);
         }
 
-        try {
-            result.landmarks = await performNearbySearch(lat, lng, apiKey, region);
-        } catch {
-            // Ignore nearby search errors
+        // Ignore nearby search errors
+        if (nearbyOutcome.status === "fulfilled") {
+            result.landmarks = nearbyOutcome.value;
         }
 
         return NextResponse.json(result);
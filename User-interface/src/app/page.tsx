@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useCallback } from "react";
+import { useState, useCallback, useEffect, useRef } from "react";
 import dynamic from "next/dynamic";
 import {
   Loader2,
@@ -16,9 +16,11 @@ import ZoneBanner from "@/components/zone-banner";
 import JsonViewer from "@/components/json-viewer";
 import { getExifGps, getDeviceLocation } from "@/lib/exif";
 import { checkSensitiveZones } from "@/lib/geo";
+import { createPreviewUrl, getUploadPayload, releaseUploadPayload } from "@/lib/image";
 import type {
   GpsSource,
   ZoneCheckResult,
+  SensitiveZone,
   SensitiveZonesData,
   WasteTicket,
   LocationResult,
@@ -39,6 +41,22 @@ const NEAREST_ZONE_RADIUS_M = 100;
 // Default location (Coimbatore center) when EXIF and device GPS are unavailable
 const DEFAULT_COORDS = { lat: 11.0168, lng: 76.9558 };
 
+// Sensitive zones are static: fetch and parse them once per page load
+let sensitiveZonesCache: SensitiveZone[] | null = null;
+
+async function loadSensitiveZones(): Promise<SensitiveZone[]> {
+  if (sensitiveZonesCache) return sensitiveZonesCache;
+  try {
+    const res = await fetch("/sensitive_zones.json");
+    const zonesData = (await res.json()) as SensitiveZonesData;
+    sensitiveZonesCache = zonesData.sensitive_zones || [];
+    return sensitiveZonesCache;
+  } catch (e) {
+    console.warn("Failed to load sensitive zones:", e);
+    return [];
+  }
+}
+
 type AnalysisStep =
   | "idle"
   | "extracting_gps"
@@ -75,7 +93,22 @@ export default function Home() {
   const [areaName, setAreaName] = useState<string | null>(null);
   const [ticket, setTicket] = useState<WasteTicket | null>(null);
 
+  // File whose preview is wanted; guards against a slow preview landing after a newer selection
+  const previewFileRef = useRef<File | null>(null);
+
+  // On unmount, make any still-pending preview revoke its URL instead of setting state
+  useEffect(() => () => {
+    previewFileRef.current = null;
+  }, []);
+
+  // Release the previous preview's blob URL when the file changes or on unmount
+  useEffect(() => {
+    if (!previewUrl) return;
+    return () => URL.revokeObjectURL(previewUrl);
+  }, [previewUrl]);
+
   const handleFileSelect = useCallback((file: File | null) => {
+    previewFileRef.current = file;
     if (!file) {
       setSelectedFile(null);
       setPreviewUrl(null);
@@ -89,7 +122,11 @@ export default function Home() {
       return;
     }
     setSelectedFile(file);
-    setPreviewUrl(URL.createObjectURL(file));
+    setPreviewUrl(null);
+    createPreviewUrl(file).then((url) => {
+      if (previewFileRef.current === file) setPreviewUrl(url);
+      else URL.revokeObjectURL(url);
+    });
     // Reset results
     setStep("idle");
     setGpsSource(null);
@@ -145,15 +182,7 @@ export default function Home() {
   };
 
   const performZoneCheck = async (lat: number, lng: number) => {
-    let zonesData: SensitiveZonesData | null = null;
-    try {
-      const res = await fetch("/sensitive_zones.json");
-      zonesData = await res.json();
-    } catch (e) {
-      console.warn("Failed to load sensitive zones:", e);
-    }
-
-    const zones = zonesData?.sensitive_zones || [];
+    const zones = await loadSensitiveZones();
     return checkSensitiveZones(lat, lng, zones, NEAREST_ZONE_RADIUS_M);
   };
 
@@ -184,13 +213,7 @@ export default function Home() {
 
       setStep("analyzing_waste");
 
-      const arrayBuffer = await selectedFile.arrayBuffer();
-      const base64 = btoa(
-        new Uint8Array(arrayBuffer).reduce(
-          (data, byte) => data + String.fromCodePoint(byte),
-          ""
-        )
-      );
+      const base64 = await getUploadPayload(selectedFile);
 
       const analyzeRes = await fetch("/api/analyze-waste", {
         method: "POST",
@@ -205,8 +228,10 @@ export default function Home() {
       });
 
       if (!analyzeRes.ok) {
-        throw new Error(`Waste analysis failed: ${analyzeRes.statusText}`);
+        const { error } = (await analyzeRes.json().catch(() => ({}))) as { error?: string };
+        throw new Error(`Waste analysis failed: ${error || analyzeRes.statusText}`);
       }
+      releaseUploadPayload(selectedFile);
 
       const wasteTicket = (await analyzeRes.json()) as WasteTicket;
 
@@ -13,10 +13,11 @@ const ACCEPTED_TYPES = new Set([
     "image/jpeg",
     "image/jpg",
     "image/png",
+    "image/gif",
+    "image/webp",
     "image/tiff",
-    "image/heic",
 ]);
-const ACCEPTED_EXTENSIONS = ".jpg,.jpeg,.png,.tiff,.heic";
+const ACCEPTED_EXTENSIONS = ".jpg,.jpeg,.png,.gif,.webp,.tiff,.tif";
 const MAX_SIZE_BYTES = 200 * 1024 * 1024; // 200MB
 
 function formatSize(bytes: number): string {
@@ -38,9 +39,10 @@ export default function FileUpload({
         (file: File) => {
             setError(null);
             const ext = file.name.split(".").pop()?.toLowerCase();
-            const validExt = ["jpg", "jpeg", "png", "tiff", "heic"];
+            const validExt = ["jpg", "jpeg", "png", "gif", "webp", "tiff", "tif"];
             if (!ACCEPTED_TYPES.has(file.type) && (!ext || !validExt.includes(ext))) {
-                setError("Unsupported file type. Use JPG, PNG, TIFF, or HEIC.");
+                // Keep in sync with UNSUPPORTED_FORMAT_ERROR in api/analyze-waste/route.ts
+                setError("Unsupported image format. Use JPG, PNG, GIF, WebP or TIFF.");
                 return;
             }
             if (file.size > MAX_SIZE_BYTES) {
@@ -118,7 +120,7 @@ export default function FileUpload({
                             Drag & drop your waste image here
                         </p>
                         <p className="mt-1 text-xs text-slate-500">
-                            Accepted: JPG, JPEG, PNG, TIFF, HEIC · Max 200 MB
+                            Accepted: JPG, PNG, GIF, WebP, TIFF · Max 200 MB
                         </p>
                     </div>
                 </div>
@@ -132,15 +134,22 @@ export default function FileUpload({
             )}
 
             {/* Preview */}
-            {selectedFile && previewUrl && (
+            {selectedFile && (
                 <div className="flex items-start gap-4 rounded-xl border border-slate-200 bg-white p-4">
                     <div className="relative h-24 w-24 flex-shrink-0 overflow-hidden rounded-lg border border-slate-200">
-                        {/* eslint-disable-next-line @next/next/no-img-element */}
-                        <img
-                            src={previewUrl}
-                            alt="Preview"
-                            className="h-full w-full object-cover"
-                        />
+                        {previewUrl ? (
+                            // eslint-disable-next-line @next/next/no-img-element
+                            <img
+                                src={previewUrl}
+                                alt="Preview"
+                                className="h-full w-full object-cover"
+                            />
+                        ) : (
+                            // Thumbnail still being generated
+                            <div className="flex h-full w-full items-center justify-center bg-slate-100">
+                                <FileImage className="h-6 w-6 text-slate-400" />
+                            </div>
+                        )}
                     </div>
                     <div className="flex-1 min-w-0">
                         <div className="flex items-center gap-2">
@@ -0,0 +1,82 @@
+/**
+ * Read a file/blob as a bare base64 string (browser-side).
+ * Uses the native data-URL encoder instead of building a binary string
+ * byte by byte, so the image is only held once in JS memory.
+ */
+export function readFileAsBase64(file: Blob): Promise<string> {
+    return new Promise((resolve, reject) => {
+        const reader = new FileReader();
+        reader.onload = () => {
+            const dataUrl = reader.result as string;
+            resolve(dataUrl.slice(dataUrl.indexOf(",") + 1));
+        };
+        reader.onerror = () => reject(reader.error);
+        reader.readAsDataURL(file);
+    });
+}
+
+const uploadPayloadCache = new WeakMap<File, Promise<string>>();
+
+/**
+ * Base64 upload payload for a file, prepared once per selected File and
+ * reused when the same file is analysed again (e.g. retry after an error).
+ * Call releaseUploadPayload once the upload succeeds.
+ */
+export function getUploadPayload(file: File): Promise<string> {
+    let payload = uploadPayloadCache.get(file);
+    if (!payload) {
+        payload = readFileAsBase64(file);
+        uploadPayloadCache.set(file, payload);
+        payload.catch(() => uploadPayloadCache.delete(file));
+    }
+    return payload;
+}
+
+/** Drop a cached payload once it has been accepted, so the base64 copy is not kept alive. */
+export function releaseUploadPayload(file: File): void {
+    uploadPayloadCache.delete(file);
+}
+
+// Small JPEG/PNG files are handed to <img> as-is; only large or exotic files
+// are decoded here into a thumbnail for the 96 px preview tile.
+const PREVIEW_PASSTHROUGH_MAX_BYTES = 2_000_000;
+const PREVIEW_PASSTHROUGH_TYPES = new Set(["image/jpeg", "image/jpg", "image/png"]);
+const PREVIEW_SIZE_PX = 192;
+const PREVIEW_JPEG_QUALITY = 0.8;
+
+/**
+ * Object URL for the upload preview. Falls back to the original file when
+ * the browser cannot decode it. Callers own the URL and must revoke it.
+ */
+export async function createPreviewUrl(file: File): Promise<string> {
+    if (file.size <= PREVIEW_PASSTHROUGH_MAX_BYTES && PREVIEW_PASSTHROUGH_TYPES.has(file.type)) {
+        return URL.createObjectURL(file);
+    }
+
+    try {
+        const bitmap = await createImageBitmap(file, {
+            resizeHeight: PREVIEW_SIZE_PX,
+            resizeQuality: "medium",
+        });
+        const canvas = document.createElement("canvas");
+        canvas.width = bitmap.width;
+        canvas.height = bitmap.height;
+        const ctx = canvas.getContext("2d");
+        if (ctx) {
+            // JPEG has no alpha: paint white first so transparent pixels do not export as black
+            ctx.fillStyle = "#ffffff";
+            ctx.fillRect(0, 0, canvas.width, canvas.height);
+            ctx.drawImage(bitmap, 0, 0);
+        }
+        bitmap.close();
+        const blob = await new Promise<Blob | null>((resolve) =>
+            canvas.toBlob(resolve, "image/jpeg", PREVIEW_JPEG_QUALITY)
+        );
+        canvas.width = 0;
+        canvas.height = 0;
+        if (blob) return URL.createObjectURL(blob);
+    } catch {
+        // Undecodable here (e.g. TIFF outside Safari) — let <img> try the original
+    }
+    return URL.createObjectURL(file);
+}
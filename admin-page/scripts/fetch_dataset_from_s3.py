@@ -31,6 +31,11 @@ except ImportError:
 
 import boto3
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 BUCKET = os.environ.get("S3_BUCKET", "internal-testing-1")
 INPUT_PREFIX = os.environ.get("S3_INPUT_PREFIX", "input/")
 OUTPUT_FILE = project_root / "public" / "dataset.json"
@@ -64,15 +69,20 @@ def get_dataset_from_s3():
     if EXPECTED_BUCKET_OWNER:
         get_kwargs["ExpectedBucketOwner"] = EXPECTED_BUCKET_OWNER
     resp = s3.get_object(**get_kwargs)
-    body = resp["Body"].read().decode("utf-8")
-    return json.loads(body)
+    body = resp["Body"].read()
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body.decode("utf-8"))
 
 
 def main():
     data = get_dataset_from_s3()
     OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        OUTPUT_FILE.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
     count = len(data) if isinstance(data, list) else "?"
     print(f"Fetched {count} records from s3://{BUCKET}/{INPUT_PREFIX} -> {OUTPUT_FILE}")
 
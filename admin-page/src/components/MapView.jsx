@@ -140,7 +140,7 @@ export default function MapView({
   }
 
   return (
-    <MapContainer center={center} zoom={12} style={{ height: "100%", width: "100%" }}>
+    <MapContainer center={center} zoom={12} preferCanvas={true} style={{ height: "100%", width: "100%" }}>
       <TileLayer
         url="https://{s}.basemaps.cartocdn.com/rastertiles/voyager/{z}/{x}/{y}{r}.png"
         attribution='&copy; <a href="https://carto.com">CARTO</a> &copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a>'
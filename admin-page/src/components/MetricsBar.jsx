@@ -1,4 +1,4 @@
-import React from "react";
+import React, { useMemo } from "react";
 import PropTypes from "prop-types";
 import { ZONE_COLORS, ZONE_VEHICLE } from "../utils/zones";
 
@@ -12,11 +12,18 @@ function Kpi({ label, value, color = "text-slate-800", bg = "bg-white" }) {
 }
 
 export default function MetricsBar({ data, zone, startCoords, endCoords, showRoutes, dataSource, totalStops, onRefreshData }) {
-  const p0 = data.filter(d => d.priority === "P0").length;
-  const totalKg = data.reduce((s, d) => s + (d.estimated_weight_kg || 0), 0);
-  const hazardCount = data.filter(d => d.stagnant_water_detected || d.smoke_detected || d.animal_presence).length;
-  const sensitiveCount = data.filter(d => d.near_sensitive_zone).length;
-  const dispatchNow = data.filter(d => d.action === "DISPATCH_NOW").length;
+  // Single pass over the stops for all KPIs, recomputed only when data changes
+  const { p0, totalKg, hazardCount, sensitiveCount, dispatchNow } = useMemo(() => {
+    const kpis = { p0: 0, totalKg: 0, hazardCount: 0, sensitiveCount: 0, dispatchNow: 0 };
+    for (const d of data) {
+      if (d.priority === "P0") kpis.p0++;
+      kpis.totalKg += d.estimated_weight_kg || 0;
+      if (d.stagnant_water_detected || d.smoke_detected || d.animal_presence) kpis.hazardCount++;
+      if (d.near_sensitive_zone) kpis.sensitiveCount++;
+      if (d.action === "DISPATCH_NOW") kpis.dispatchNow++;
+    }
+    return kpis;
+  }, [data]);
   const zoneColor = zone === "ALL" ? "#3b82f6" : ZONE_COLORS[zone];
 
   return (
@@ -1,4 +1,4 @@
-import React, { useState } from "react";
+import React, { useState, useMemo } from "react";
 import PropTypes from "prop-types";
 import { ALL_ZONES, ZONE_COLORS, ZONE_VEHICLE } from "../utils/zones";
 
@@ -106,6 +106,12 @@ export default function Sidebar({
 }) {
   const dispatchNow = filteredData.filter(d => d.action === "DISPATCH_NOW").length;
   const addToRoute = filteredData.filter(d => d.action === "ADD_TO_ROUTE").length;
+  // Group stops by zone in one pass instead of re-filtering allData per zone
+  const zoneCounts = useMemo(() => {
+    const counts = {};
+    for (const d of allData) counts[d.zone] = (counts[d.zone] || 0) + 1;
+    return counts;
+  }, [allData]);
 
   return (
     <div className="w-64 bg-white border-r border-slate-200 flex flex-col overflow-y-auto shrink-0 shadow-sm">
@@ -126,7 +132,7 @@ export default function Sidebar({
           </button>
           {ALL_ZONES.filter(z => z !== "ALL").map(zone => {
             const color = ZONE_COLORS[zone];
-            const cnt = allData.filter(d => d.zone === zone).length;
+            const cnt = zoneCounts[zone] || 0;
             const active = selectedZone === zone;
             return (
               <button key={zone} onClick={() => setSelectedZone(zone)}
@@ -33,6 +33,9 @@ async function loadEnv() {
   }
 }
 
+// Default max concurrent GetObject calls when aggregating per-ticket JSON files
+const DEFAULT_FETCH_BATCH_SIZE = 16;
+
 const MIMES = { jpeg: "image/jpeg", jpg: "image/jpeg", png: "image/png", gif: "image/gif", webp: "image/webp" };
 
 // ---------------------------------------------------------------------------
@@ -53,6 +56,24 @@ function buildS3Client(S3Client) {
   return new S3Client({ region, ...(credentials && { credentials }) });
 }
 
+let s3ContextPromise = null;
+
+/**
+ * Load env and build the S3 client once per dev-server process; later requests
+ * reuse the same client (and its pooled connections). A failed init is retried.
+ */
+function getS3Context() {
+  s3ContextPromise ??= (async () => {
+    await loadEnv();
+    const sdk = await import("@aws-sdk/client-s3");
+    return { sdk, s3: buildS3Client(sdk.S3Client) };
+  })().catch((err) => {
+    s3ContextPromise = null;
+    throw err;
+  });
+  return s3ContextPromise;
+}
+
 /**
  * List all .json keys under prefix (multi-page) then download and merge them.
  * Returns the parsed dataset array (or object).
@@ -84,14 +105,21 @@ async function fetchDatasetFromS3(s3, { ListObjectsV2Command, GetObjectCommand }
     return { data: JSON.parse(body), key: singleKey };
   }
 
-  // 3. Aggregate per-ticket files
+  // 3. Aggregate per-ticket files, fetching up to S3_FETCH_BATCH_SIZE at a time (order preserved)
+  const configuredBatchSize = Number.parseInt(process.env.S3_FETCH_BATCH_SIZE ?? "", 10);
+  const batchSize = configuredBatchSize >= 1 ? configuredBatchSize : DEFAULT_FETCH_BATCH_SIZE;
   const results = [];
-  for (const key of jsonKeys) {
-    const obj = await s3.send(new GetObjectCommand({ Bucket: bucket, Key: key }));
-    const body = await obj.Body.transformToString();
-    const parsed = JSON.parse(body);
-    if (Array.isArray(parsed)) results.push(...parsed);
-    else if (parsed && typeof parsed === "object") results.push(parsed);
+  for (let i = 0; i < jsonKeys.length; i += batchSize) {
+    const batch = await Promise.all(
+      jsonKeys.slice(i, i + batchSize).map(async (key) => {
+        const obj = await s3.send(new GetObjectCommand({ Bucket: bucket, Key: key }));
+        return JSON.parse(await obj.Body.transformToString());
+      })
+    );
+    for (const parsed of batch) {
+      if (Array.isArray(parsed)) results.push(...parsed);
+      else if (parsed && typeof parsed === "object") results.push(parsed);
+    }
   }
   console.log("[S3 dataset] bucket:", bucket, "aggregated:", jsonKeys.length, "files under", prefix);
   return { data: results, key: prefix };
@@ -109,11 +137,9 @@ async function handleDatasetRequest(res) {
     return;
   }
 
-  await loadEnv();
-  const s3Sdk = await import("@aws-sdk/client-s3");
+  const { sdk: s3Sdk, s3 } = await getS3Context();
   const bucket = process.env.S3_BUCKET || "internal-testing-1";
   const prefix = (process.env.S3_INPUT_PREFIX || "coimbatore/").replace(/\/?$/, "/");
-  const s3 = buildS3Client(s3Sdk.S3Client);
 
   const result = await fetchDatasetFromS3(s3, s3Sdk, bucket, prefix);
   if (!result) {
@@ -154,10 +180,8 @@ async function handleImageRequest(res, keyParam) {
     return;
   }
 
-  await loadEnv();
-  const { GetObjectCommand, S3Client } = await import("@aws-sdk/client-s3");
+  const { sdk: { GetObjectCommand }, s3 } = await getS3Context();
   const bucket = process.env.S3_BUCKET || "internal-testing-1";
-  const s3 = buildS3Client(S3Client);
 
   console.log("[S3 image] bucket:", bucket, "file:", keyParam);
   const obj = await s3.send(new GetObjectCommand({ Bucket: bucket, Key: keyParam }));